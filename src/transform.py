@@ -1099,11 +1099,11 @@ def _quality_control(df:pd.DataFrame) -> pd.DataFrame:
         ,'review_notes'
     ]
     non_nullables = [x for x in df.columns if x not in nullables]
-    for c in non_nullables:
-        if df[c].isna().all():
-            print("--------------------------------------------------------------------------------")
-            print(f'WARNING (a): non-nullable field `{c}` is null in all rows')
-            print("")
+    all_null = df[non_nullables].isna().all() # one pass over the frame instead of one per column
+    for c in all_null.index[all_null]:
+        print("--------------------------------------------------------------------------------")
+        print(f'WARNING (a): non-nullable field `{c}` is null in all rows')
+        print("")
 
     # business rule-checking logic
     # if `review_status` IN ['verified', 'in_review'], the following fields are non-nullable
@@ -1128,10 +1128,13 @@ def _quality_control(df:pd.DataFrame) -> pd.DataFrame:
             ,'skip_req_photo'
             ]
 
+    # compute the status filter and the null flags once, then count nulls per column in one pass
+    status_mask = (df['review_status'].isin(statuses)) & (df['delete_record'].isna()==False) & (df['delete_record']!='yes')
+    nulls = df[non_nullables].isna()
+    null_counts = nulls[status_mask].sum()
     for c in non_nullables:
-        mask = (df['review_status'].isin(statuses)) & (df[c].isna()) & (df['delete_record'].isna()==False) & (df['delete_record']!='yes')
-        problems = df[mask]
-        if len(problems) >0:
+        if null_counts[c] >0:
+                problems = df[status_mask & nulls[c]]
                 print("--------------------------------------------------------------------------------")
                 print(f'WARNING (b): non-nullable field `{c}` is null in {round(((len(problems))/len(df)*100),2)}% of rows of verified records')
                 print('Resolve these warnings by assigning a value to this column\nE.g.,')
@@ -1422,6 +1425,10 @@ def _add_methodspeciationname(df:pd.DataFrame) -> pd.DataFrame:
         ludf['MethodSpeciationName'] = np.where(mask, v['MethodSpeciationName'], ludf['MethodSpeciationName'])
         ludf['ResultSampleFractionText'] = np.where(mask, v['ResultSampleFractionText'], ludf['ResultSampleFractionText'])
     
+    if isinstance(df['Characteristic_Name'].dtype, pd.CategoricalDtype):
+        # match the categorical dtype of `df` so the merge joins on category codes
+        ludf = ludf[ludf['Characteristic_Name'].isin(df['Characteristic_Name'].cat.categories)]
+        ludf = ludf.astype({'Characteristic_Name': df['Characteristic_Name'].dtype})
     df = pd.merge(df, ludf, how='left', on='Characteristic_Name')
 
     after_len = len(df)
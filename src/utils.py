@@ -38,6 +38,14 @@ Examples:
 
 import shutil
 import os
+import csv
+import errno
+import subprocess
+import functools
+import contextlib
+import zipfile
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import src.assets as assets
 import src.water_backup as wtb
 import src.transform as tf
@@ -46,6 +54,12 @@ import pandas as pd
 import time
 import numpy as np
 
+_USERID = os.environ.get('USERNAME') or os.environ.get('USER') or '' # looked up once; written to every job-log entry
+_LOG_HEADER = ('userid','log_timestamp','src_file','log_dest','log_result','log_fpath') # column order of the job-log csv; rows built in `_add_log_entry()` follow it
+_BACKUP_DIRNAME_RE = re.compile(r'\d{4}-\d{2}-\d{2}_\d{6}(_\d{6})?$') # backup folder names; older folders omit the microseconds when they were 0
+_EXTRACT_TABLE_RE = re.compile(r'_0|ysi|grabsample') # csvs in the AGOL collection that `_extract()` reads
+_EXTRACT_CACHE:dict = {} # (zip fpath, mtime, size) : tables returned by `_extract()`
+
 def backup_water(dest_dir:str=assets.DM_WATER_BACKUP_FPATH, verbose:bool=False, test_run:bool=True) -> None:
     """Generic to make backups of NCRN water source files
 
@@ -63,43 +77,99 @@ def backup_water(dest_dir:str=assets.DM_WATER_BACKUP_FPATH, verbose:bool=False,
 
     """
     start_time = time.time()
-    assert os.path.exists(dest_dir)==True, print(f'You provided {dest_dir=}, which is a directory that does not exist or is not visible to this computer. Check your filepath.')
+    _require_dir(p=dest_dir, label='dest_dir')
 
     # make new directory to receive backup files
-    dir_ext:str = str(dt.datetime.now()).replace(' ','_').replace('.','_').replace(':','')
-    newpath:str = os.path.join(dest_dir, dir_ext)
-    
+    dir_ext:str = _timestamp_dirname()
+    newpath:str = _make_new_backup_dir(dest_dir=dest_dir, verbose=verbose, dir_ext=dir_ext) # create it up front; the source dirs and the hosted-feature download all write into it
 
     # download a csv of each table, and save each csv (for from-source-data restoration and/or input for ETL)
     # wtb._download_csvs(newpath=newpath, verbose=verbose, dir_ext=dir_ext)
 
-    # copy the survey source-files
-    dirs=assets.SURVEY_SOURCE_DIRS
-    for d in dirs:
-        try:
-            # _backup_make_file_copies(src_dir=d, dest_dir=dest_dir, filetypes=['*'], verbose=verbose)
-            _backup_make_file_copies(dir_ext=dir_ext, newpath=newpath, src_dir=d, filetypes=['*'], verbose=verbose)
-        except:
-            _add_log_entry(log_timestamp=dir_ext, src_file=d, log_dest=newpath, log_result='fail - unable to copy file')
-            if verbose == True:
-                print(f'Unable to copy directory {d=}. Files not backed up.')
-
-    # download a copy of the hosted feature (for 1:1 restoration)
-    if test_run==True:
-        wtb._agol_hosted_feature(newpath=newpath, in_fc=assets.WATER_AGOL_ITEM_ID, verbose=verbose, dir_ext=dir_ext, download_types=['CSV'])
-    else:
-        wtb._agol_hosted_feature(newpath=newpath, in_fc=assets.WATER_AGOL_ITEM_ID, verbose=verbose, dir_ext=dir_ext, download_types=['CSV','File Geodatabase'])
+    # the source-file and hosted-feature log entries are written together when the run finishes
+    with _log_batch() as log_rows:
+        # copy the survey source-files; the directories are independent (often on different shares) so copy them concurrently
+        dirs=assets.SURVEY_SOURCE_DIRS
+        dests = _source_dir_dests(dirs=dirs, newpath=newpath) # each source dir gets its own subfolder so the concurrent copies can't collide
+        with ThreadPoolExecutor(max_workers=max(1, len(dirs))) as ex:
+            for rows in ex.map(lambda d, dest: _backup_source_dir(dir_ext=dir_ext, newpath=dest, src_dir=d, verbose=verbose), dirs, dests):
+                log_rows.extend(rows) # `map()` yields in the order of `dirs`, so the log order doesn't depend on which copy finishes first
+
+        # download a copy of the hosted feature (for 1:1 restoration)
+        if test_run:
+            wtb._agol_hosted_feature(newpath=newpath, in_fc=assets.WATER_AGOL_ITEM_ID, verbose=verbose, dir_ext=dir_ext, download_types=['CSV'], log_rows=log_rows)
+        else:
+            wtb._agol_hosted_feature(newpath=newpath, in_fc=assets.WATER_AGOL_ITEM_ID, verbose=verbose, dir_ext=dir_ext, download_types=['CSV','File Geodatabase'], log_rows=log_rows)
 
-    end_time = time.time()
-    elapsed_time = end_time - start_time
-    elapsed_time = str(dt.timedelta(seconds=elapsed_time))
-    elapsed_time = elapsed_time.split('.')[0]
+    elapsed_time = _elapsed_time(start_time)
 
-    if verbose == True:
+    if verbose:
         print(f'`backup_water()` completed. Elapsed time: {elapsed_time}')
 
     return None
 
+def _source_dir_dests(dirs:list, newpath:str) -> list:
+    """Name a backup subfolder for each source directory, for `backup_water()`
+
+    Each subfolder is named for its source directory; a drive or share root (e.g., 'D:\\' or '\\\\server\\share\\') is named for the drive or share (e.g., 'D' or 'server_share'). Sources that share a folder name (e.g., '\\\\shareA\\data' and '\\\\shareB\\data') get their position in `dirs` as a suffix (e.g., 'data_0' and 'data_1') so they don't copy into the same subfolder.
+
+    Args:
+        dirs (list): relative or absolute paths to the source directories
+        newpath (str): relative or absolute path to the backup directory for this run
+
+    Raises:
+        ValueError: two source directories would still share a subfolder (e.g., 'data', 'data', and 'data_1')
+
+    Returns:
+        list: the subfolder for each directory in `dirs`, in the same order
+    """
+    names = [_source_dir_name(src_dir=d) for d in dirs]
+    names = [f'{n}_{i}' if names.count(n) > 1 else n for i, n in enumerate(names)]
+    if len(set(names)) != len(names):
+        raise ValueError(f'Unable to give each source directory its own backup subfolder; {dirs=} became {names=}')
+
+    return [os.path.join(newpath, n) for n in names]
+
+def _source_dir_name(src_dir:str) -> str:
+    """Name the backup subfolder for one source directory, for `_source_dir_dests()`
+
+    Args:
+        src_dir (str): relative or absolute path to the source directory
+
+    Returns:
+        str: the directory's folder name; for a drive or share root, which has no folder name, the drive or share with its separators replaced (e.g., 'D' or 'server_share'), or 'root' for '/'
+    """
+    p = os.path.normpath(src_dir)
+    name = os.path.basename(p)
+    if name == '':
+        # basename() of a root is '', which would copy into the backup directory itself
+        name = re.sub(r'[\\/:]+', '_', os.path.splitdrive(p)[0]).strip('_') or 'root'
+
+    return name
+
+def _backup_source_dir(dir_ext:str, newpath:str, src_dir:str, verbose:bool) -> list:
+    """Back up one survey source directory for `backup_water()`, recording a failure instead of raising
+
+    Args:
+        dir_ext (str): the timestamp of this backup run
+        newpath (str): relative or absolute path to this directory's subfolder of the backup directory, from `_source_dir_dests()`
+        src_dir (str): relative or absolute path to the survey source directory to copy
+        verbose (bool): True turns on interactive messaging
+
+    Returns:
+        list: the job-log entries for this directory, for `_write_log_entries()`
+    """
+    log_rows:list = []
+    try:
+        _backup_make_file_copies(dir_ext=dir_ext, newpath=newpath, src_dir=src_dir, filetypes=['*'], verbose=verbose, log_rows=log_rows)
+    except Exception as e:
+        print(e)
+        _add_log_entry(log_timestamp=dir_ext, src_file=src_dir, log_dest=newpath, log_result='fail - unable to copy file', log_rows=log_rows)
+        if verbose:
+            print(f'Unable to copy directory {src_dir=}. Files not backed up.')
+
+    return log_rows
+
 def backup_veg(src_dir:str=assets.VEG_T_DRIVE_FPATH, dest_dir:str=assets.DM_VEG_BACKUP_FPATH, filetypes:list=['.accdb'], verbose:bool=False) -> None:
     """Generic to make backups of NCRN forest vegetation source files
 
@@ -126,26 +196,63 @@ def backup_veg(src_dir:str=assets.VEG_T_DRIVE_FPATH, dest_dir:str=assets.DM_VEG_
     """
     start_time = time.time()
     # check that the source directory and file exist
-    assert os.path.exists(src_dir)==True, print(f'You provided {src_dir=}, which is a directory that does not exist or is not visible to this computer. Check your filepath.')
-    assert os.path.exists(dest_dir)==True, print(f'You provided {dest_dir=}, which is a directory that does not exist or is not visible to this computer. Check your filepath.')
-    assert len(filetypes)>0, print(f'You provided {filetypes=}, which is an empty list. Provide one or more file extensions to copy from `src_dir` to `dest_dir`.')
+    _require_dir(p=src_dir, label='src_dir')
+    _require_dir(p=dest_dir, label='dest_dir')
+    if len(filetypes) == 0:
+        raise ValueError(f'You provided {filetypes=}, which is an empty list. Provide one or more file extensions to copy from `src_dir` to `dest_dir`.')
 
     # extend `dest_dir` with a timestamp and check that that directory does not exist
-    dir_ext:str = str(dt.datetime.now()).replace(' ','_').replace('.','_').replace(':','')
+    dir_ext:str = _timestamp_dirname()
     newpath:str = _make_new_backup_dir(dest_dir=dest_dir, verbose=verbose, dir_ext=dir_ext)
     _backup_make_file_copies(dir_ext=dir_ext, newpath=newpath, src_dir=src_dir, filetypes=filetypes, verbose=verbose)
 
-    end_time = time.time()
-    elapsed_time = end_time - start_time
-    elapsed_time = str(dt.timedelta(seconds=elapsed_time))
-    elapsed_time = elapsed_time.split('.')[0]
+    elapsed_time = _elapsed_time(start_time)
 
-    if verbose == True:
+    if verbose:
         print(f'`backup_veg()` completed. Elapsed time: {elapsed_time}')
 
     return None
 
-def _add_log_entry(log_timestamp:str, src_file:str, log_dest:str, log_result:str, log_fpath:str=assets.DM_BACKUP_LOG_FPATH) -> None:
+def _timestamp_dirname() -> str:
+    """Make the timestamp used to name backup directories and job-log entries
+
+    Returns:
+        str: the current local time formatted like '2024-08-22_134502_123456'
+    """
+    return dt.datetime.now().strftime('%Y-%m-%d_%H%M%S_%f')
+
+def _elapsed_time(start_time:float) -> str:
+    """Format the time since `start_time` for the completion messages
+
+    Args:
+        start_time (float): a `time.time()` reading taken when the job started
+
+    Returns:
+        str: the elapsed time to the whole second, e.g. '0:08:12'
+    """
+    return str(dt.timedelta(seconds=int(time.time() - start_time)))
+
+def _require_dir(p:str, label:str) -> None:
+    """Check that a directory exists before a job starts writing to it
+
+    Unlike `assert`, the check still runs under `python -O`, and the error carries the message (`assert x, print(...)` raises `AssertionError: None`).
+
+    Args:
+        p (str): relative or absolute path to the directory
+        label (str): the argument name to show in the error message, e.g. 'dest_dir'
+
+    Raises:
+        NotADirectoryError: `p` does not exist, is not a directory, or is not visible to this computer
+
+    Returns:
+        None
+    """
+    if not os.path.isdir(p):
+        raise NotADirectoryError(f'You provided {label}={p!r}, which is a directory that does not exist or is not visible to this computer. Check your filepath.')
+
+    return None
+
+def _add_log_entry(log_timestamp:str, src_file:str, log_dest:str, log_result:str, log_fpath:str=assets.DM_BACKUP_LOG_FPATH, log_rows:list=None) -> None:
     """Make an entry in the job-log for each file
 
     Args:
@@ -154,27 +261,67 @@ def _add_log_entry(log_timestamp:str, src_file:str, log_dest:str, log_result:str
         log_dest (str): _description_
         log_result (str): _description_
         log_fpath (str, optional): _description_. Defaults to assets.DM_BACKUP_LOG_FPATH.
+        log_rows (list, optional): A list that accumulates log entries so the caller can write them in one pass with `_write_log_entries()`. If None, the entry is appended to `log_fpath` immediately. Defaults to None.
 
     Returns:
         _type_: _description_
     """
-    # make a dataframe with one row to append to the log file
-    log = pd.DataFrame(columns=['userid','log_timestamp','src_file','log_dest','log_result','log_fpath'])
-    log['userid'] = [os.environ.get('USERNAME')]
-    log['log_timestamp'] = [log_timestamp]
-    log['log_dest'] = [log_dest]
-    log['log_result'] = [log_result]
-    log['log_fpath'] = [log_fpath]
-    log['src_file'] = [src_file]
-
-    # if log doesn't exist, create it
-    if os.path.exists(log_fpath):
-        existing_log = pd.read_csv(log_fpath)
-        log = pd.concat([existing_log, log])
-    log.to_csv(log_fpath, index=False)
+    row = (_USERID, log_timestamp, src_file, log_dest, log_result, log_fpath)
+    if log_rows is not None:
+        log_rows.append(row)
+    else:
+        _write_log_entries(log_rows=[row], log_fpath=log_fpath)
+
+    return None
+
+def _write_log_entries(log_rows:list, log_fpath:str=assets.DM_BACKUP_LOG_FPATH) -> None:
+    """Append accumulated job-log entries to the log file in one write
+
+    Args:
+        log_rows (list): A list of log-entry tuples built by `_add_log_entry()`
+        log_fpath (str, optional): relative or absolute filepath to the job-log csv. Defaults to assets.DM_BACKUP_LOG_FPATH.
+
+    Returns:
+        None
+    """
+    if len(log_rows) == 0:
+        return None
+
+    # if log doesn't exist (or is empty), create it with a header
+    # in append mode the position starts at the end of the file, so tell() == 0 means there's nothing in it yet
+    with open(log_fpath, 'a', newline='', buffering=1<<20) as f:
+        writer = csv.writer(f)
+        if f.tell() == 0:
+            writer.writerow(_LOG_HEADER)
+        writer.writerows(log_rows)
 
     return None
 
+@contextlib.contextmanager
+def _log_batch(log_rows:list=None):
+    """Collect job-log entries in a list and write them in one pass when the block exits, even if it raises part-way through
+
+    Functions that can run on their own or as one step of a bigger job take an optional `log_rows`: on their own they write their entries when they finish; as a step, they add to the caller's list and the caller writes the whole job at once.
+
+    Args:
+        log_rows (list, optional): The caller's list of log entries. If given, entries are added to it and left for the caller to write. If None, a new list is made and written to the job-log when the block exits. Defaults to None.
+
+    Yields:
+        list: the list to pass to `_add_log_entry()` as `log_rows`
+
+    Examples:
+        with _log_batch(log_rows=log_rows) as log_rows:
+            _add_log_entry(log_timestamp=dir_ext, src_file=f, log_dest=dest, log_result='success', log_rows=log_rows)
+    """
+    flush_log = log_rows is None
+    if flush_log:
+        log_rows = []
+    try:
+        yield log_rows
+    finally:
+        if flush_log:
+            _write_log_entries(log_rows=log_rows)
+
 def _make_new_backup_dir(dest_dir:str, verbose:bool, dir_ext:str) -> str:
     """Make a new directory inside an existing directory
 
@@ -190,48 +337,182 @@ def _make_new_backup_dir(dest_dir:str, verbose:bool, dir_ext:str) -> str:
     # if dir exists, fail
     newpath = os.path.join(dest_dir, dir_ext)
     # assert os.path.exists(newpath) == False, print(f'Your target directory {newpath=} already exists and this function is not allowed to overwrite existing data. The newpath is a timestamp so you can just try call the function again.')
-    # if it does not exist, make dir
-    if os.path.exists(newpath)==False:
+    # if it does not exist, make dir; attempting the mkdir directly avoids a separate exists() round-trip to the share
+    try:
         os.makedirs(newpath)
-        if verbose == True:
+        if verbose:
             print(f'made dir: {newpath=}')
+    except FileExistsError:
+        pass
 
     return newpath
 
-def _backup_make_file_copies(dir_ext:str, newpath:str, src_dir:str, filetypes:list, verbose:bool) -> None:
-
-    # copy the source file(s) from the source directory to the target directory
-    filetypes = tuple(set(filetypes))
-    source_files = []
-    if filetypes == ('*',):
-        shutil.copytree(src_dir, newpath)
-        log_res = 'success'
-        for d in os.listdir(src_dir):
-            _add_log_entry(log_timestamp=dir_ext, src_file=src_dir, log_dest=os.path.join(newpath, d), log_result=log_res)
-            if verbose == True:
-                print(f'copied {d} to {newpath}')
+def _copy_tree(src_dir:str, newpath:str, max_workers:int=8) -> None:
+    """Copy a whole directory tree, using multithreaded robocopy on Windows and `_parallel_copytree()` elsewhere
+
+    Args:
+        src_dir (str): relative or absolute path to the directory to copy
+        newpath (str): relative or absolute path to the destination directory
+        max_workers (int, optional): number of files to copy at once. Defaults to 8.
+
+    Returns:
+        None
+    """
+    if os.name == 'nt' and shutil.which('robocopy'):
+        # /E matches copytree (includes empty subdirectories); /COPY:DAT keeps data, attributes, and timestamps like copy2
+        # /R:1 /W:1 stops a locked file from stalling the run (robocopy defaults to 1 million retries 30 sec apart)
+        # robocopy return codes below 8 mean success
+        res = subprocess.run(['robocopy', src_dir, newpath, '/E', '/COPY:DAT', '/R:1', '/W:1', f'/MT:{max_workers}', '/NFL', '/NDL', '/NJH', '/NJS', '/NP'], check=False)
+        if res.returncode >= 8:
+            raise OSError(f'robocopy failed to copy {src_dir=} to {newpath=} with return code {res.returncode}')
     else:
-        for file in os.listdir(src_dir):
-            if file.endswith(filetypes):
-                # print(os.path.join(src_dir, file))
-                source_files.append(os.path.join(src_dir, file))
-        # print(source_files)
-        if len(source_files) > 0:
-            for f in source_files:
-                try:
-                    shutil.copy2(f, newpath)
-                    log_res = 'success'
-                    _add_log_entry(log_timestamp=dir_ext, src_file=f, log_dest=os.path.join(newpath, f.rsplit('\\',1)[1]), log_result=log_res)
-                    if verbose == True:
-                        print(f'copied {f} to {newpath}')
-                except Exception as e:
-                    print(e)
-                    log_res = 'fail'
-                    _add_log_entry(log_timestamp=dir_ext, src_file=f, log_dest=os.path.join(newpath, f.rsplit('\\',1)[1]), log_result=log_res)
+        _parallel_copytree(src_dir=src_dir, newpath=newpath, max_workers=max_workers)
+
+    return None
+
+def _parallel_copytree(src_dir:str, newpath:str, max_workers:int=8) -> None:
+    """Copy a whole directory tree like `shutil.copytree()`, copying the files concurrently
+
+    Args:
+        src_dir (str): relative or absolute path to the directory to copy
+        newpath (str): relative or absolute path to the destination directory; created if it doesn't exist, and existing files are overwritten (like `dirs_exist_ok=True`)
+        max_workers (int, optional): number of files to copy at once. Defaults to 8.
+
+    Raises:
+        NotADirectoryError: `src_dir` does not exist or is not a directory; nothing is created at `newpath`
+        shutil.Error: one or more files failed to copy; the error lists (src, dst, reason) for each failure, with dst None for a directory that couldn't be read
+
+    Returns:
+        None
+    """
+    _require_dir(p=src_dir, label='src_dir') # like copytree, fail before creating `newpath` so a missing source doesn't leave an empty backup folder
+    os.makedirs(newpath, exist_ok=True) # like copytree(dirs_exist_ok=True), so a retry into the same backup folder succeeds
+    dirs_copied = []
+    errors = []
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        futures = {}
+        # os.walk() skips unreadable directories unless told otherwise; report them like copytree does so the backup isn't logged as a success
+        for root, dirs, files in os.walk(src_dir, followlinks=True, onerror=lambda e: errors.append((e.filename, None, str(e)))):
+            dst_root = os.path.normpath(os.path.join(newpath, os.path.relpath(root, src_dir)))
+            os.makedirs(dst_root, exist_ok=True)
+            dirs_copied.append((root, dst_root))
+            # like copytree, symlinked directories are copied as real directories, but one that points back up the tree (a loop) would recurse forever
+            # its contents are already being copied from the ancestor, so don't descend into it
+            root_real = os.path.realpath(root)
+            dirs[:] = [d for d in dirs if not _is_symlink_loop(path=os.path.join(root, d), root_real=root_real)]
+            for f in files:
+                src = os.path.join(root, f)
+                dst = os.path.join(dst_root, f)
+                futures[ex.submit(_copy_file, src, dst)] = (src, dst)
+        for fut in as_completed(futures):
+            try:
+                fut.result()
+            except OSError as e:
+                src, dst = futures[fut]
+                errors.append((src, dst, str(e)))
+
+    # copy directory metadata last so the file copies don't change it
+    for src, dst in dirs_copied:
+        shutil.copystat(src, dst)
+    if len(errors) > 0:
+        raise shutil.Error(errors)
+
+    return None
+
+def _is_symlink_loop(path:str, root_real:str) -> bool:
+    """Check whether a directory is a symlink to the directory being walked or one of its ancestors, for `_parallel_copytree()`
+
+    Args:
+        path (str): relative or absolute path to a subdirectory found by `os.walk()`
+        root_real (str): the resolved (`os.path.realpath()`) path of the directory containing `path`
+
+    Returns:
+        bool: True if following `path` would walk the same directories again
+    """
+    if not os.path.islink(path):
+        return False
+    target = os.path.realpath(path)
+
+    return root_real == target or root_real.startswith(target.rstrip(os.sep) + os.sep)
+
+def _copy_file(src:str, dst:str) -> str:
+    """Copy a file and its metadata, using in-kernel `os.copy_file_range()` where the platform supports it
+
+    Args:
+        src (str): relative or absolute filepath to the file to copy
+        dst (str): relative or absolute filepath (or directory) to copy `src` to
+
+    Returns:
+        str: the filepath of the new copy
+    """
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    if not hasattr(os, 'copy_file_range'):
+        return shutil.copy2(src, dst)
+    try:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            src_fd = fsrc.fileno()
+            dst_fd = fdst.fileno()
+            src_size = os.fstat(src_fd).st_size
+            size = max(src_size, 2**20)
+            copied = 0
+            while True:
+                n = os.copy_file_range(src_fd, dst_fd, size)
+                if n == 0:
+                    break
+                copied += n
+    except OSError as e:
+        if e.errno not in (errno.EXDEV, errno.ENOTSUP, errno.EOPNOTSUPP, errno.ENOSYS, errno.EINVAL):
+            raise
+        # filesystem doesn't support copy_file_range; fall back to a regular copy
+        # copy2 re-opens `dst` with 'wb', so anything copied before the error is truncated and the copy starts over
+        return shutil.copy2(src, dst)
+    if copied == 0 and src_size > 0:
+        # some filesystems (e.g., FUSE, CIFS) report 0 bytes copied instead of raising; fall back like CPython's own fast-copy does
+        return shutil.copy2(src, dst)
+    shutil.copystat(src, dst)
+
+    return dst
+
+def _backup_make_file_copies(dir_ext:str, newpath:str, src_dir:str, filetypes:list, verbose:bool, log_rows:list=None, max_workers:int=8) -> None:
+
+    with _log_batch(log_rows=log_rows) as log_rows:
+        # copy the source file(s) from the source directory to the target directory
+        filetypes = tuple({x.lower() for x in filetypes}) # extensions match case-insensitively, e.g. '.ACCDB'
+        source_files = []
+        if filetypes == ('*',):
+            _copy_tree(src_dir=src_dir, newpath=newpath, max_workers=max_workers)
+            log_res = 'success'
+            for d in os.listdir(src_dir):
+                _add_log_entry(log_timestamp=dir_ext, src_file=src_dir, log_dest=os.path.join(newpath, d), log_result=log_res, log_rows=log_rows)
+                if verbose:
+                    print(f'copied {d} to {newpath}')
         else:
-            if verbose == True:
-                print(f'No files of type {filetypes=} found in {src_dir=}. No files backed up.')
-            _add_log_entry(log_timestamp=dir_ext, src_file=None, log_dest=newpath, log_result='no_files')
+            with os.scandir(src_dir) as it:
+                source_files = [e.path for e in it if e.is_file() and e.name.lower().endswith(filetypes)]
+            # print(source_files)
+            if len(source_files) > 0:
+                # copy in parallel; log entries are made from this thread in `source_files` order so the job log is the same run to run
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(source_files))) as ex:
+                    futures = {}
+                    for f in source_files:
+                        dest = os.path.join(newpath, os.path.basename(f))
+                        futures[ex.submit(_copy_file, f, dest)] = (f, dest)
+                    for fut, (f, dest) in futures.items():
+                        try:
+                            fut.result()
+                            log_res = 'success'
+                            _add_log_entry(log_timestamp=dir_ext, src_file=f, log_dest=dest, log_result=log_res, log_rows=log_rows)
+                            if verbose:
+                                print(f'copied {f} to {newpath}')
+                        except Exception as e:
+                            print(e)
+                            log_res = 'fail'
+                            _add_log_entry(log_timestamp=dir_ext, src_file=f, log_dest=dest, log_result=log_res, log_rows=log_rows)
+            else:
+                if verbose:
+                    print(f'No files of type {filetypes=} found in {src_dir=}. No files backed up.')
+                _add_log_entry(log_timestamp=dir_ext, src_file=None, log_dest=newpath, log_result='no_files', log_rows=log_rows)
 
     return None
 
@@ -266,31 +547,24 @@ def dashboard_etl(test_run:bool=False, include_deletes:bool=False, verbose:bool=
     
     # Transform steps
     df:pd.DataFrame = tf._transform(df_dict=df_dict, include_deletes=include_deletes)
-    dashboard_cols = pd.read_csv(r'data\ncrn_discrete_water_dashboard_be_20240822.csv', nrows=5).columns
     
     # QC checks
-    if verbose == True:
+    if verbose:
         tf._quality_control(df)
     
-    df = df[dashboard_cols]
+    df = df.loc[:, list(_dashboard_columns())] # raises KeyError if the transform stopped producing a dashboard column
 
-    if test_run == True:
+    if test_run:
         print('df returned')
-        if verbose == True:
-            end_time = time.time()
-            elapsed_time = end_time - start_time
-            elapsed_time = str(dt.timedelta(seconds=elapsed_time))
-            elapsed_time = elapsed_time.split('.')[0]
+        if verbose:
+            elapsed_time = _elapsed_time(start_time)
             print(f'`dashboard_etl()` completed. Elapsed time: {elapsed_time}')
         return df
     else:
         fname = wtb._save_dashboard_csv(df, newest_data_folder, verbose)
         wtb._load_feature(fname, assets.WATER_PROD_QC_DASHBOARD_BACKEND, verbose)
-        if verbose == True:
-            end_time = time.time()
-            elapsed_time = end_time - start_time
-            elapsed_time = str(dt.timedelta(seconds=elapsed_time))
-            elapsed_time = elapsed_time.split('.')[0]
+        if verbose:
+            elapsed_time = _elapsed_time(start_time)
             print(f'`dashboard_etl()` completed. Elapsed time: {elapsed_time}')
         return True
 
@@ -575,7 +849,7 @@ def _wqp_metadata_char_incongruency(df:pd.DataFrame, md:pd.DataFrame) -> pd.Data
     
     deletes = [x for x in md.DataName.unique() if x not in df.CharacteristicName.unique() and x not in updates.keys()] # present in md but absent from df; delete or update
     if len(deletes) > 0:
-        mask = (md['DataName'].isin(deletes)==False)
+        mask = (~md['DataName'].isin(deletes))
         md = md[mask].reset_index(drop=True)
 
     # adds
@@ -673,7 +947,7 @@ def _wqp_metadata_char_incongruency(df:pd.DataFrame, md:pd.DataFrame) -> pd.Data
     for k,v in lu.items():
         for b in blanks:
             template = md[md['DataName']==md.DataName.unique()[0]].copy().reset_index(drop=True) # make a "template" 1-row dataframe with the correct columns
-            mask = (template[b].isna()==False)
+            mask = template[b].notna()
             template[b] = np.where(mask, None, template[b]) # blank-out all of the columns that are present in the lookup `lu`
         for x,y in v.items():
             template[x] = y # now fill-in the blanks from `lu`
@@ -897,7 +1171,7 @@ def _wqp_metadata_qc(df:pd.DataFrame, md:pd.DataFrame) -> None:
         ,'UpperDescription': 'AssessmentDetails'
     }
     for k,v in conditionally_nullable.items():
-        mask = (md[k].isna()==False) & (md[v].isna())
+        mask = (md[k].notna()) & (md[v].isna())
         sub = md[mask]
         if len(sub) > 0:
             print(f'WARNING: conditinally-nullable field {v} was null in {len(sub)} rows of wqp metadata.')
@@ -961,7 +1235,7 @@ def _wqp_metadata_site_incongruency(df:pd.DataFrame, md:pd.DataFrame) -> pd.Data
 
     # Incongruencies can go in either of two directions: adds or deletes
     deletes = [x for x in md.SiteCodeWQX.unique() if x not in df.MonitoringLocationIdentifier.unique()] # anything present in md but absent from df should be deleted from md
-    mask = (md['SiteCodeWQX'].isin(deletes)==False)
+    mask = (~md['SiteCodeWQX'].isin(deletes))
     md = md[mask].reset_index(drop=True)
 
     adds = [x for x in df.MonitoringLocationIdentifier.unique() if x not in md.SiteCodeWQX.unique()] # anything present in df but absent in md should be added to md
@@ -1078,6 +1352,110 @@ def water_sites(out_filename:str) -> pd.DataFrame:
 
     return df  
 
+_WQP_XWALK = { # crosswalk from NCRN columns to WQP columns; see `wqp_wqx()`
+    'cols':{ # columns that have a 1:1 match between the NCRN dataframe and wqp; these determine nrow in the output wqp dataframe
+        #  colname from wqp : colname from df
+        'ActivityIdentifier':'activity_id'
+        ,'ActivityMediaSubdivisionName':'activity_group_id'
+        ,'ActivityStartDate':'activity_start_date'
+        ,'ActivityStartTime/Time':'activity_start_time'
+        ,'ActivityStartTime/TimeZoneCode':'timezone'
+        ,'MonitoringLocationIdentifier':'location_id'
+        ,'MonitoringLocationName':'ncrn_site_name'
+        # ,'ActivityCommentText':'site_visit_notes'
+        ,'ActivityLocation/LatitudeMeasure':'ncrn_latitude'
+        ,'ActivityLocation/LongitudeMeasure':'ncrn_longitude'
+        ,'ResultDetectionConditionText':'data_quality_flag'
+        ,'CharacteristicName':'Characteristic_Name'
+        ,'ResultMeasureValue':'Result_Text'
+        ,'ResultMeasure/MeasureUnitCode':'Result_Unit'
+        ,'ResultAnalyticalMethod/MethodIdentifier':'grouping_var'
+        ,'LaboratoryName':'lab'
+        ,'MethodSpeciationName':'MethodSpeciationName'
+        ,'ResultSampleFractionText':'ResultSampleFractionText'
+        ,'SampleCollectionEquipmentName':'instrument'
+        ,'DetectionQuantitationLimitMeasure/MeasureValue':'quantlimit'
+        ,'DetectionQuantitationLimitMeasure/MeasureUnitCode':'quantlimitunit'
+    }
+    ,'constants':{ # columns that are constants and need to repeat nrow times in the output wqp dataframe
+        # colname from wqp : value to assign to that column
+        'OrganizationIdentifier':'NCRN'
+        ,'OrganizationFormalName':'National Park Service Inventory and Monitoring Division'
+        ,'ActivityCommentText':None # do not export comments
+        # ,'ActivityMediaName':'Water'
+        ,'ActivityEndDate':np.nan
+        ,'ActivityEndTime/Time':np.nan
+        ,'ActivityEndTime/TimeZoneCode':None
+        ,'ActivityRelativeDepthName':None
+        ,'ActivityDepthHeightMeasure/MeasureValue':np.nan
+        ,'ActivityDepthHeightMeasure/MeasureUnitCode':None
+        ,'ActivityDepthAltitudeReferencePointText':None
+        ,'ActivityTopDepthHeightMeasure/MeasureValue':np.nan
+        ,'ActivityTopDepthHeightMeasure/MeasureUnitCode':None
+        ,'ActivityTopDepthHeightMeasure/MeasureUnitCode':None
+        ,'ActivityBottomDepthHeightMeasure/MeasureValue':np.nan
+        ,'ActivityBottomDepthHeightMeasure/MeasureUnitCode':None
+        ,'ProjectIdentifier':'USNPS NCRN Perennial stream water monitoring'
+        ,'ProjectName':'USNPS NCRN Perennial stream water monitoring'
+        ,'ActivityConductingOrganizationText':'USNPS National Capital Region Inventory and Monitoring'
+        ,'SampleAquifer':None
+        ,'HydrologicCondition':None
+        ,'HydrologicEvent':None
+        ,'SampleCollectionMethod/MethodIdentifier':None
+        ,'SampleCollectionMethod/MethodIdentifierContext':None
+        ,'SampleCollectionMethod/MethodName':np.nan
+        ,'SampleCollectionMethod/MethodDescriptionText':np.nan
+        # ,'SampleCollectionEquipmentName':None
+        # ,'MethodSpeciationName':None
+        # ,'ResultSampleFractionText':None
+        ,'MeasureQualifierCode':None
+        # ,'ResultCommentText':'Final'
+        ,'StatisticalBaseCode':None
+        # ,'ResultValueTypeName':'Actual'
+        ,'ResultWeightBasisText':None
+        ,'ResultTemperatureBasisText':None
+        ,'ResultParticleSizeBasisText':None
+        ,'DataQuality/PrecisionValue':np.nan
+        ,'DataQuality/BiasValue':np.nan
+        ,'DataQuality/ConfidenceIntervalValue':np.nan
+        ,'DataQuality/UpperConfidenceLimitValue':np.nan
+        ,'DataQuality/LowerConfidenceLimitValue':np.nan
+        ,'ResultCommentText':None
+        ,'ResultStatusIdentifier':'Final'
+        ,'USGSPCode':None
+        ,'ResultDepthHeightMeasure/MeasureValue':np.nan
+        ,'ResultDepthHeightMeasure/MeasureUnitCode':None
+        ,'ResultDepthAltitudeReferencePointText':None
+        ,'SubjectTaxonomicName':None # is NA for water but is not NA for BSS
+        ,'SampleTissueAnatomyName':None
+        ,'BinaryObjectFileName':None
+        ,'BinaryObjectFileTypeCode':None
+        ,'ResultFileUrl':None # TODO: update to data package?
+        ,'ResultAnalyticalMethod/MethodIdentifierContext':None
+        ,'ResultAnalyticalMethod/MethodName':None
+        ,'ResultAnalyticalMethod/MethodUrl':None
+        ,'ResultAnalyticalMethod/MethodDescriptionText':None
+        ,'AnalysisStartDate':np.nan
+        ,'ResultLaboratoryCommentText':None
+        ,'ResultDetectionQuantitationLimitUrl':None
+        ,'DetectionQuantitationLimitTypeName':None
+        # ,'DetectionQuantitationLimitMeasure/MeasureValue':np.nan
+        # ,'DetectionQuantitationLimitMeasure/MeasureUnitCode':None
+        ,'LabSamplePreparationUrl':None
+        ,'LastUpdated':None # stamped with the current time in `wqp_wqx()`
+        ,'ProviderName':'National Park Service Inventory and Monitoring Division'
+        ,'ResultTimeBasisText':None
+    }
+    ,'calculated':{ # columns that need to be re-calculated each time the dataset is produced
+        # colname from wqp : function that takes `wqp` and returns the column values
+        'ResultIdentifier': lambda wqp: np.arange(len(wqp)) # df has a fresh RangeIndex after the merge in `tf._add_methodspeciationname()`
+        ,'ActivityMediaName': lambda wqp: np.where(wqp['CharacteristicName'].isin(['air_temperature', 'barometric_pressure', 'weather_condition']), 'Air', 'Water')
+        ,'ActivityTypeCode': lambda wqp: np.where(wqp['ResultAnalyticalMethod/MethodIdentifier']=='NCRN_WQ_WCHEM', 'Sample-Routine', 'Field Msr/Obs')
+        ,'ResultValueTypeName': lambda wqp: np.where(wqp['SampleCollectionEquipmentName'] == 'calculated_result','Calculated','Actual')
+        # ,'ActivityIdentifier': lambda wqp: wqp["ActivityMediaSubdivisionName"]+"|"+wqp["ResultAnalyticalMethod/MethodIdentifier"]
+    }
+}
+
 def wqp_wqx(test_run:bool=False) -> pd.DataFrame:
     
     include_deletes:bool=False
@@ -1088,6 +1466,7 @@ def wqp_wqx(test_run:bool=False) -> pd.DataFrame:
     
     # Transform steps
     df:pd.DataFrame = tf._transform(df_dict=df_dict, include_deletes=include_deletes)
+    df['Characteristic_Name'] = df['Characteristic_Name'].astype('category') # low-cardinality; speeds up the `isin()` filters and merges below
     # QC checks
     df = _wqp_qc(df=df)
     df = tf._assign_activity_id(df=df)
@@ -1095,150 +1474,67 @@ def wqp_wqx(test_run:bool=False) -> pd.DataFrame:
     df = tf._add_quantitationlimit(df)
     df = tf._quality_control(df)
 
-    # import the example file
-    example:pd.DataFrame = pd.read_csv(assets.EXAMPLE_WQX_WQP, nrows=1)
-    if 'Unnamed: 0' in example.columns:
-        del example['Unnamed: 0']
+    # import the example file's columns
+    example_cols:tuple = _wqx_columns()
 
     # crosswalk columns
-    wqp:pd.DataFrame = pd.DataFrame(columns=example.columns)
-
-    xwalk = {
-        'cols':{ # columns that have a 1:1 match between the NCRN dataframe and wqp; these determine nrow in the output wqp dataframe
-            #  colname from wqp : colname from df
-            'ActivityIdentifier':'activity_id'
-            ,'ActivityMediaSubdivisionName':'activity_group_id'
-            ,'ActivityStartDate':'activity_start_date'
-            ,'ActivityStartTime/Time':'activity_start_time'
-            ,'ActivityStartTime/TimeZoneCode':'timezone'
-            ,'MonitoringLocationIdentifier':'location_id'
-            ,'MonitoringLocationName':'ncrn_site_name'
-            # ,'ActivityCommentText':'site_visit_notes'
-            ,'ActivityLocation/LatitudeMeasure':'ncrn_latitude'
-            ,'ActivityLocation/LongitudeMeasure':'ncrn_longitude'
-            ,'ResultDetectionConditionText':'data_quality_flag'
-            ,'CharacteristicName':'Characteristic_Name'
-            ,'ResultMeasureValue':'Result_Text'
-            ,'ResultMeasure/MeasureUnitCode':'Result_Unit'
-            ,'ResultAnalyticalMethod/MethodIdentifier':'grouping_var'
-            ,'LaboratoryName':'lab'
-            ,'MethodSpeciationName':'MethodSpeciationName'
-            ,'ResultSampleFractionText':'ResultSampleFractionText'
-            ,'SampleCollectionEquipmentName':'instrument'
-            ,'DetectionQuantitationLimitMeasure/MeasureValue':'quantlimit'
-            ,'DetectionQuantitationLimitMeasure/MeasureUnitCode':'quantlimitunit'
-        }
-        ,'constants':{ # columns that are constants and need to repeat nrow times in the output wqp dataframe
-            # colname from wqp : value to assign to that column
-            'OrganizationIdentifier':'NCRN'
-            ,'OrganizationFormalName':'National Park Service Inventory and Monitoring Division'
-            ,'ActivityCommentText':None # do not export comments
-            # ,'ActivityMediaName':'Water'
-            ,'ActivityEndDate':np.NaN
-            ,'ActivityEndTime/Time':np.NaN
-            ,'ActivityEndTime/TimeZoneCode':None
-            ,'ActivityRelativeDepthName':None
-            ,'ActivityDepthHeightMeasure/MeasureValue':np.NaN
-            ,'ActivityDepthHeightMeasure/MeasureUnitCode':None
-            ,'ActivityDepthAltitudeReferencePointText':None
-            ,'ActivityTopDepthHeightMeasure/MeasureValue':np.NaN
-            ,'ActivityTopDepthHeightMeasure/MeasureUnitCode':None
-            ,'ActivityTopDepthHeightMeasure/MeasureUnitCode':None
-            ,'ActivityBottomDepthHeightMeasure/MeasureValue':np.NaN
-            ,'ActivityBottomDepthHeightMeasure/MeasureUnitCode':None
-            ,'ProjectIdentifier':'USNPS NCRN Perennial stream water monitoring'
-            ,'ProjectName':'USNPS NCRN Perennial stream water monitoring'
-            ,'ActivityConductingOrganizationText':'USNPS National Capital Region Inventory and Monitoring'
-            ,'SampleAquifer':None
-            ,'HydrologicCondition':None
-            ,'HydrologicEvent':None
-            ,'SampleCollectionMethod/MethodIdentifier':None
-            ,'SampleCollectionMethod/MethodIdentifierContext':None
-            ,'SampleCollectionMethod/MethodName':np.NaN
-            ,'SampleCollectionMethod/MethodDescriptionText':np.NaN
-            # ,'SampleCollectionEquipmentName':None
-            # ,'MethodSpeciationName':None
-            # ,'ResultSampleFractionText':None
-            ,'MeasureQualifierCode':None
-            # ,'ResultCommentText':'Final'
-            ,'StatisticalBaseCode':None
-            # ,'ResultValueTypeName':'Actual'
-            ,'ResultWeightBasisText':None
-            ,'ResultTemperatureBasisText':None
-            ,'ResultParticleSizeBasisText':None
-            ,'DataQuality/PrecisionValue':np.NaN
-            ,'DataQuality/BiasValue':np.NaN
-            ,'DataQuality/ConfidenceIntervalValue':np.NaN
-            ,'DataQuality/UpperConfidenceLimitValue':np.NaN
-            ,'DataQuality/LowerConfidenceLimitValue':np.NaN
-            ,'ResultCommentText':None
-            ,'ResultStatusIdentifier':'Final'
-            ,'USGSPCode':None
-            ,'ResultDepthHeightMeasure/MeasureValue':np.NaN
-            ,'ResultDepthHeightMeasure/MeasureUnitCode':None
-            ,'ResultDepthAltitudeReferencePointText':None
-            ,'SubjectTaxonomicName':None # is NA for water but is not NA for BSS
-            ,'SampleTissueAnatomyName':None
-            ,'BinaryObjectFileName':None
-            ,'BinaryObjectFileTypeCode':None
-            ,'ResultFileUrl':None # TODO: update to data package?
-            ,'ResultAnalyticalMethod/MethodIdentifierContext':None
-            ,'ResultAnalyticalMethod/MethodName':None
-            ,'ResultAnalyticalMethod/MethodUrl':None
-            ,'ResultAnalyticalMethod/MethodDescriptionText':None
-            ,'AnalysisStartDate':np.NaN
-            ,'ResultLaboratoryCommentText':None
-            ,'ResultDetectionQuantitationLimitUrl':None
-            ,'DetectionQuantitationLimitTypeName':None
-            # ,'DetectionQuantitationLimitMeasure/MeasureValue':np.NaN
-            # ,'DetectionQuantitationLimitMeasure/MeasureUnitCode':None
-            ,'LabSamplePreparationUrl':None
-            ,'LastUpdated':dt.datetime.now()
-            ,'ProviderName':'National Park Service Inventory and Monitoring Division'
-            ,'ResultTimeBasisText':None
-        }
-        ,'calculated':{ # columns that need to be re-calculated each time the dataset is produced
-            'ResultIdentifier':'wqp["ResultIdentifier"]=wqp.index'
-            ,'ActivityMediaName' : "wqp['ActivityMediaName'] = np.where(wqp['CharacteristicName'].isin(['air_temperature', 'barometric_pressure', 'weather_condition']), 'Air', 'Water')"
-            ,'ActivityTypeCode' : "wqp['ActivityTypeCode'] = np.where(wqp['ResultAnalyticalMethod/MethodIdentifier']=='NCRN_WQ_WCHEM', 'Sample-Routine', 'Field Msr/Obs')"
-            ,'ResultValueTypeName': "wqp['ResultValueTypeName'] = np.where(wqp['SampleCollectionEquipmentName'] == 'calculated_result','Calculated','Actual')"
-            # ,'ActivityIdentifier':'wqp["ActivityIdentifier"]=wqp["ActivityMediaSubdivisionName"]+"|"+wqp["ResultAnalyticalMethod/MethodIdentifier"]'
-        }
-    }
-    assert len(xwalk['cols']) + len(xwalk['constants']) + len(xwalk['calculated']) == len(example.columns) # sanity check that the `xwalk`` is complete
+    xwalk:dict = _WQP_XWALK
+
+    assert len(xwalk['cols']) + len(xwalk['constants']) + len(xwalk['calculated']) == len(example_cols) # sanity check that the `xwalk`` is complete
 
     # assign based on xwalk
-    for k in xwalk.keys():
-        if k == 'cols':
-            for x,y in xwalk[k].items():
-                try:
-                    wqp[x] = df[y]
-                except:
-                    print(f'failed: {x=} and {y=}')
-        elif k == 'constants':
-            for x,y in xwalk[k].items():
-                try:
-                    wqp[x] = y
-                except:
-                    print(f'failed: {x=} and {y=}')
-        elif k == 'calculated':
-            for x, y in xwalk[k].items():
-                try:
-                    exec(y)
-                except:
-                    print(f"WARNING! Calculated column `xwalk['{k}']['{x}']`, code line `{y}` failed.")
+    # gather the 1:1 columns and the constants, then build `wqp` in one construction rather than inserting one column at a time
+    col_data:dict = {}
+    missing = [(x,y) for x,y in xwalk['cols'].items() if y not in df.columns]
+    for x,y in missing:
+        print(f'failed: {x=} and {y=}')
+    for x,y in xwalk['cols'].items():
+        if y in df.columns:
+            col_data[x] = df[y].to_numpy()
+    for x,y in xwalk['constants'].items():
+        col_data[x] = y # scalars are broadcast to nrow
+    col_data['LastUpdated'] = dt.datetime.now()
+    wqp:pd.DataFrame = pd.DataFrame(col_data, index=df.index, columns=example_cols)
+
+    for x, fn in xwalk['calculated'].items():
+        try:
+            wqp[x] = fn(wqp)
+        except Exception as e:
+            print(f"WARNING! Calculated column `xwalk['calculated']['{x}']` failed: {e}")
     
     wqp = _recode_wqp_chars(wqp=wqp)
 
-    if test_run == False:
-        fname = f'{newest_data_folder}\\wqp.csv'
+    if not test_run:
+        fname = os.path.join(newest_data_folder, 'wqp.csv')
         wqp.to_csv(fname, index=False)
         print(f'\nWrote wqp to: {fname}\n')
-        mdfname = f'{newest_data_folder}\\wqp_ncrnwater_metadata.csv'
+        mdfname = os.path.join(newest_data_folder, 'wqp_ncrnwater_metadata.csv')
         md = wqp_metadata(df=fname, write=mdfname)
 
     return wqp
 
+@functools.lru_cache(maxsize=1)
+def _dashboard_columns() -> tuple:
+    """Read the column names of the dashboard back-end template once per session
+
+    Returns:
+        tuple: The column names of the dashboard back-end csv, in order
+    """
+    cols = pd.read_csv(r'data\ncrn_discrete_water_dashboard_be_20240822.csv', nrows=0).columns # header only
+
+    return tuple(cols)
+
+@functools.lru_cache(maxsize=1)
+def _wqx_columns() -> tuple:
+    """Read the column names of the example WQX file once per session
+
+    Returns:
+        tuple: The column names of `assets.EXAMPLE_WQX_WQP`, in order, without the pandas index column
+    """
+    cols = pd.read_csv(assets.EXAMPLE_WQX_WQP, nrows=0).columns
+
+    return tuple(x for x in cols if x != 'Unnamed: 0')
+
 def _recode_wqp_chars(wqp:pd.DataFrame) -> pd.DataFrame:
     """Recode the characteristic names from NCRN charnames to WQP charnames
 
@@ -1314,10 +1610,6 @@ def _wqp_qc(df:pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: dataframe in WQP format
     """
 
-    # exclude unverified and review-in-progress records
-    df = df[df['review_status']=='verified']
-    df.reset_index(inplace=True, drop=True)
-
     # exclude characteristics by name
     excludes = [
         'left_bank_riparian_width'
@@ -1333,8 +1625,11 @@ def _wqp_qc(df:pd.DataFrame) -> pd.DataFrame:
         ,'rain_last_24'
         ,'chlorine'
     ]
-    mask = (df['Characteristic_Name'].isin(excludes)==False)
-    df = df[mask]
+    # exclude unverified and review-in-progress records, and the excluded characteristics, in one pass
+    # `review_status` has a handful of values and is compared again in every check in `tf._quality_control()`; as a categorical those comparisons run on integer codes
+    df['review_status'] = df['review_status'].astype('category')
+    mask = (df['review_status']=='verified') & (~df['Characteristic_Name'].isin(excludes))
+    df = df[mask].reset_index(drop=True)
 
     # re-code lab names per time period
     # activity_start_date < 2016-10-01 ~'CUE'
@@ -1367,7 +1662,7 @@ def _wqp_qc(df:pd.DataFrame) -> pd.DataFrame:
     
     # 'equipment_malfunction'
     # When the result is flagged as 'equipment_malfunction', the result should be updated to NA.
-    mask = (df['data_quality_flag']=='equipment_malfunction') & (df['Result_Text'].isna()==False)
+    mask = (df['data_quality_flag']=='equipment_malfunction') & (df['Result_Text'].notna())
     # mask = (df['ResultDetectionConditionText']=='equipment_malfunction') & (df['ResultMeasureValue'].isna()==False)
     df['Result_Text'] = np.where(mask, None, df['Result_Text'])
 
@@ -1411,6 +1706,8 @@ def _wqp_qc(df:pd.DataFrame) -> pd.DataFrame:
 def _extract(newest_data_folder:str) -> dict:
     """Call-stacking function for extract steps
 
+    The tables are cached for the session, keyed by the zip's path, mtime, and size; each call returns its own copies of the cached dataframes.
+
     Args:
         data_folder (str): relative or absolute filepath to a folder containing timestamped folders containing the .zip csv-collection downloaded from AGOL.
 
@@ -1419,37 +1716,63 @@ def _extract(newest_data_folder:str) -> dict:
     """
 
     # look at the contents of that newest folder and find a .zip file with 'csv' in the filename
-    targets = os.listdir(newest_data_folder)
-    targets = [x for x in targets if x.endswith('.zip') and 'csv' in x]
+    with os.scandir(newest_data_folder) as it:
+        targets = [e.name for e in it if e.is_file() and e.name.endswith('.zip') and 'csv' in e.name]
     assert len(targets) > 0, print(f'Returned zero csv collections in {newest_data_folder=}')
     target = os.path.join(newest_data_folder, max(targets))
 
-    # unzip the files
-    newdir = target.rsplit('.zip',1)[0].rsplit('\\',1)[-1]
-    shutil.unpack_archive(target, os.path.join(newest_data_folder, newdir))
-
-    # extract each table
-    extracted_dir = os.path.join(newest_data_folder, newdir)
-    tbls = os.listdir(extracted_dir)
-    tbls_fnames = [x for x in tbls if '_0' in x or 'ysi' in x or 'grabsample' in x]
-    for i in range(len(tbls_fnames)):
-        if '_0' in tbls_fnames[i]:
-            tbls_fnames[i] = 'tbl_main'
-        else:
-            tbls_fnames[i] = tbls_fnames[i].rsplit('_',1)[0]
-    tbls_fpaths = [os.path.join(extracted_dir, x) for x in tbls if '_0' in x or 'ysi' in x or 'grabsample' in x]
-    assert len(tbls_fnames) == len(tbls_fpaths)
-    df_dict:dict = {tbls_fnames[i]: {'fpath':tbls_fpaths[i], 'df':pd.read_csv(tbls_fpaths[i])} for i in range(len(tbls_fnames))}
+    # re-use the tables from an earlier call in this session if the zip hasn't changed
+    # every call gets its own copies, so a caller that modifies its tables (e.g., `inplace=True`) can't change what later calls return
+    stat = os.stat(target)
+    cache_key = (os.path.abspath(target), stat.st_mtime_ns, stat.st_size)
+    if cache_key in _EXTRACT_CACHE:
+        return {k: {'df':v['df'].copy()} for k,v in _EXTRACT_CACHE[cache_key].items()}
+
+    # find each table in the zip; the csvs are read straight from the archive instead of being unpacked to disk first
+    # one regex search per name picks the tables; '_0' is the main table, the others are named by their prefix
+    # (a name can match more than one alternative, e.g. 'x_ysi_0.csv', and '_0' wins, so test it directly instead of using `m.group()`)
+    with zipfile.ZipFile(target) as z:
+        tbls = [x for x in z.namelist() if '/' not in x and _EXTRACT_TABLE_RE.search(x)]
+    tbls_fnames = ['tbl_main' if '_0' in x else x.rsplit('_',1)[0] for x in tbls]
+    # read the tables concurrently, at most 8 at once; the C parser releases the GIL while tokenizing
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(tbls)))) as ex:
+        dfs = list(ex.map(lambda x: _read_zipped_csv(zip_fpath=target, member=x), tbls))
+    df_dict:dict = {tbls_fnames[i]: {'df':dfs[i]} for i in range(len(tbls_fnames))}
+    _EXTRACT_CACHE.clear() # only keep the newest collection in memory
+    _EXTRACT_CACHE[cache_key] = df_dict
+
+    return {k: {'df':v['df'].copy()} for k,v in df_dict.items()}
+
+def _read_zipped_csv(zip_fpath:str, member:str) -> pd.DataFrame:
+    """Read one csv out of a .zip archive without extracting it to disk
+
+    Args:
+        zip_fpath (str): relative or absolute filepath to the .zip archive
+        member (str): the name of the csv inside the archive
 
-    return df_dict
+    Returns:
+        pd.DataFrame: The csv as a dataframe
+    """
+    # each call opens its own handle so concurrent reads don't share a file position
+    with zipfile.ZipFile(zip_fpath) as z:
+        with z.open(member) as f:
+            df = pd.read_csv(f)
+
+    return df
 
 def _find_newest_folder(data_folder:str) -> str:
 
     # find the newest folder in a given folder
     # use the filenames to find the newest timestamp
-    dirs = [x for x in os.listdir(data_folder) if os.path.isdir(os.path.join(data_folder,x))]
-    newest_data_folder = os.path.join(data_folder, max(dirs))
-    assert os.path.isdir(newest_data_folder), print(f'data folder {newest_data_folder=} does not exist')
+    # one scandir pass; DirEntry.is_dir() uses the type returned by the directory listing instead of a stat per entry
+    # only consider folders named by `_timestamp_dirname()`, so a stray folder (e.g., 'old' or 'zz_archive') can't sort last
+    _require_dir(p=data_folder, label='data_folder')
+    with os.scandir(data_folder) as it:
+        dirs = [e for e in it if e.is_dir() and _BACKUP_DIRNAME_RE.match(e.name)]
+    if len(dirs) == 0:
+        raise FileNotFoundError(f'Found zero timestamped backup folders in {data_folder=}')
+    newest = max(dirs, key=lambda e: e.name) # the timestamp format is zero-padded, so name order is chronological
+    newest_data_folder = newest.path # already known to be a directory from the scandir pass
 
     return newest_data_folder
 
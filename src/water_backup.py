@@ -1,11 +1,9 @@
-from arcpy.da import TableToNumPyArray, ExtendTable
-from arcgis.gis import GIS
-from arcgis.features.layer import FeatureLayerCollection
-import arcpy
+# arcpy and arcgis are imported inside the functions that use them; importing arcpy takes several seconds, and most callers of this module never touch AGOL
 import pandas as pd
-import numpy as np
 import src.assets as assets
 import os
+import functools
+from concurrent.futures import ThreadPoolExecutor
 import src.utils as utils
 
 # https://github.com/vgrem/Office365-REST-Python-Client/blob/master/examples/sharepoint/files/upload.py
@@ -59,24 +57,24 @@ def _agol_tbl_to_df(in_fc:str, input_fields:list=[], query:str="", skip_nulls:bo
         df = wtb._agol_tbl_to_df(in_fc=src_assets.WATER_TBL_PHOTO_URL)
 
     """
+    OIDFieldName, field_names = _describe_fields(in_fc=in_fc)
     # if user does not specify the columns they want, return all of the columns
     if len(input_fields)==0:
-        exclusions = [
-            'Shape' # the geometry of an point is returned as a 1x2 array (similar to coordinates e.g., [5.68434189e-14, 5.68434189e-14]); the returning array `np_array` must be 1-dimensional
-        ]
-        exclusions.extend([x.name for x in arcpy.ListFields(in_fc) if 'entry_other' in x.name]) # fields like 'entry_other_anc_bottle_size' break the arcpy.da.TableToNumPyArray() call for reasons...?
-        input_fields = [x.name for x in arcpy.ListFields(in_fc) if x.name not in exclusions]
+        # skip 'Shape': the geometry of an point is returned as a 1x2 array (similar to coordinates e.g., [5.68434189e-14, 5.68434189e-14]); the returning array `np_array` must be 1-dimensional
+        # skip fields like 'entry_other_anc_bottle_size', which break the arcpy.da.TableToNumPyArray() call for reasons...?
+        input_fields = [x for x in field_names if x != 'Shape' and 'entry_other' not in x]
     # once we have a list of column names, we need to control for whether the user provided the `OID` (i.e., the table object index), 
-    OIDFieldName = arcpy.Describe(in_fc).OIDFieldName
     if OIDFieldName not in input_fields:
         final_fields = [OIDFieldName] + input_fields
     else:
         final_fields = input_fields.copy()
+    import arcpy
     np_array = arcpy.da.TableToNumPyArray(in_fc, final_fields, query, skip_nulls, null_values)
     object_id_index = np_array[OIDFieldName]
     # handle exceptions
     try:
-        fc_dataframe = pd.DataFrame(np_array, columns=final_fields, index=object_id_index)
+        # build the frame column-by-column; handing pandas the structured array makes it walk the records row-by-row
+        fc_dataframe = pd.DataFrame({x: np_array[x] for x in final_fields}, columns=final_fields, index=object_id_index)
         return fc_dataframe
     except Exception as e:
         print(f'Exception: {e}')
@@ -86,7 +84,37 @@ def _agol_tbl_to_df(in_fc:str, input_fields:list=[], query:str="", skip_nulls:bo
         print(f'{final_fields=}')
         return None
 
-def _agol_hosted_feature(newpath:str, verbose:bool, dir_ext:str, in_fc:str=assets.WATER_AGOL_ITEM_ID, download_types:list=['CSV','File Geodatabase'], fname_prefix:str='ncrn_water_') -> None:
+@functools.lru_cache(maxsize=1)
+def _get_gis() -> 'GIS':
+    """Connect to AGOL once per session
+
+    Signing in is a few network round-trips, so every AGOL call in this module shares the first connection. A failed connection raises and is not cached, so the next call tries again.
+
+    Returns:
+        arcgis.gis.GIS: the AGOL connection
+    """
+    from arcgis.gis import GIS
+    return GIS('home') # update to user/pw
+
+@functools.lru_cache(maxsize=64)
+def _describe_fields(in_fc:str) -> tuple:
+    """Look up a table's object-id field and field names once per session
+
+    Each `arcpy.Describe()` and `arcpy.ListFields()` call is a round-trip to AGOL, so repeat calls for the same table re-use the first answer.
+
+    Args:
+        in_fc (str): url to the table (the attribute or standalone table, not the root hosted feature layer)
+
+    Returns:
+        tuple: (the OID field name, a tuple of every field name in `in_fc`)
+    """
+    import arcpy
+    OIDFieldName = arcpy.Describe(in_fc).OIDFieldName
+    field_names = tuple(x.name for x in arcpy.ListFields(in_fc))
+
+    return OIDFieldName, field_names
+
+def _agol_hosted_feature(newpath:str, verbose:bool, dir_ext:str, in_fc:str=assets.WATER_AGOL_ITEM_ID, download_types:list=['CSV','File Geodatabase'], fname_prefix:str='ncrn_water_', log_rows:list=None) -> None:
     """Download a hosted feature layer as one or more filetypes
 
     Args:
@@ -95,78 +123,151 @@ def _agol_hosted_feature(newpath:str, verbose:bool, dir_ext:str, in_fc:str=asset
         dir_ext (str): The timestamp that becomes the directory name and is included in the log entry
         in_fc (str, optional): The AGOL item id for the hosted feature layer you want to download. Defaults to assets.WATER_AGOL_ITEM_ID.
         download_types (list, optional): A list of strings. Each string is a filetype specified in 
+        log_rows (list, optional): The caller's list of log entries; see `utils._log_batch()`. If None, this function writes its own entries when it finishes. Defaults to None.
 
     Returns:
         None
 
     """
-    # connect to AGOL
-    # https://www.youtube.com/watch?v=yLaIR7lmyqw&t=2089s
-    try:
-        gis = GIS('home') # update to user/pw 
-        item = gis.content.get(in_fc)
-        log_res:str = 'success'
-        fname:str = f'AGOL connection to {in_fc=}'
-        utils._add_log_entry(log_timestamp=dir_ext, src_file=in_fc, log_dest=fname, log_result=log_res)
-    except Exception as e:
-        print(f'Failed to connect to AGOL. Are you on the network?')
-        log_res:str = 'fail - unable to connect to AGOL'
-        fname:str = f'AGOL connection to {in_fc=}'
-        utils._add_log_entry(log_timestamp=dir_ext, src_file=in_fc, log_dest=fname, log_result=log_res)
-
-    for t in download_types:
-        fname:str = f'{fname_prefix}{t.lower().replace(" ","_")}_{dir_ext}'
-        ftype:str = t
-        fpath:str = os.path.join(newpath,fname)
+    with utils._log_batch(log_rows=log_rows) as log_rows:
+        # connect to AGOL
+        # https://www.youtube.com/watch?v=yLaIR7lmyqw&t=2089s
+        item = None
         try:
-            # makes a copy into your AGOL item as `ftype`, then downloads it, then deletes the item it created
-            item.export(fname, export_format=ftype, parameters=None, wait=True)
-            exported_item = gis.content.search(fname, ftype)
-            exported_item_obj = gis.content.get(exported_item[0].itemid)
-            exported_item_obj.download(save_path=newpath)
-            if exported_item_obj.title != item.title and exported_item[0].itemid != in_fc and exported_item_obj.itemid != in_fc: # nuke prod make dev sad...
-                exported_item_obj.delete(dry_run=False)
-                log_res:str = 'success'
-                utils._add_log_entry(log_timestamp=dir_ext, src_file=in_fc, log_dest=fpath, log_result=log_res)
-                if verbose == True:
-                    print(f'Saved asset {fpath}')
+            gis = _get_gis()
+            item = gis.content.get(in_fc)
+            log_res:str = 'success'
+            fname:str = f'AGOL connection to {in_fc=}'
+            utils._add_log_entry(log_timestamp=dir_ext, src_file=in_fc, log_dest=fname, log_result=log_res, log_rows=log_rows)
         except Exception as e:
-            print(f'Failed to download AGOL content.')
-            log_res:str = f'fail - unable to export {ftype} AGOL item {in_fc=}'
-            utils._add_log_entry(log_timestamp=dir_ext, src_file=in_fc, log_dest=fpath, log_result=log_res)
+            print(f'Failed to connect to AGOL. Are you on the network?')
+            log_res:str = 'fail - unable to connect to AGOL'
+            fname:str = f'AGOL connection to {in_fc=}'
+            utils._add_log_entry(log_timestamp=dir_ext, src_file=in_fc, log_dest=fname, log_result=log_res, log_rows=log_rows)
+
+        # without the item there's nothing to export, so record each download type as failed
+        if item is None:
+            for t in download_types:
+                fname:str = f'{fname_prefix}{t.lower().replace(" ","_")}_{dir_ext}'
+                fpath:str = os.path.join(newpath,fname)
+                log_res:str = f'fail - unable to export {t} AGOL item {in_fc=}'
+                utils._add_log_entry(log_timestamp=dir_ext, src_file=in_fc, log_dest=fpath, log_result=log_res, log_rows=log_rows)
+            return None
+
+        # each export is a long server-side job, so run the formats concurrently; log entries are made from this thread, in the order of `download_types`
+        with ThreadPoolExecutor(max_workers=max(1, len(download_types))) as ex:
+            futures = {}
+            for t in download_types:
+                fname:str = f'{fname_prefix}{t.lower().replace(" ","_")}_{dir_ext}'
+                futures[t] = (fname, ex.submit(_export_item, item=item, in_fc=in_fc, fname=fname, ftype=t, newpath=newpath))
+            for t in download_types:
+                fname, fut = futures[t]
+                ftype:str = t
+                fpath:str = os.path.join(newpath,fname)
+                try:
+                    if fut.result():
+                        log_res:str = 'success'
+                        utils._add_log_entry(log_timestamp=dir_ext, src_file=in_fc, log_dest=fpath, log_result=log_res, log_rows=log_rows)
+                        if verbose:
+                            print(f'Saved asset {fpath}')
+                except Exception as e:
+                    print(f'Failed to download AGOL content.')
+                    log_res:str = f'fail - unable to export {ftype} AGOL item {in_fc=}'
+                    utils._add_log_entry(log_timestamp=dir_ext, src_file=in_fc, log_dest=fpath, log_result=log_res, log_rows=log_rows)
 
     return None
 
-def _download_csvs(newpath:str, verbose:bool, dir_ext:str) -> None:
+def _export_item(item, in_fc:str, fname:str, ftype:str, newpath:str) -> bool:
+    """Export an AGOL item as one filetype, download the export, and delete the exported copy, for `_agol_hosted_feature()`
+
+    Args:
+        item (arcgis.gis.Item): the hosted feature layer to export
+        in_fc (str): The AGOL item id of `item`
+        fname (str): the title for the exported item
+        ftype (str): the export format, e.g. 'CSV' or 'File Geodatabase'
+        newpath (str): relative or absolute filepath to the directory where you want to save the file
+
+    Returns:
+        bool: True if the export was downloaded and its AGOL copy deleted; False if the export looked like the source item, so it was left alone
+    """
+    # makes a copy into your AGOL item as `ftype`, then downloads it, then deletes the item it created
+    # with wait=True, `export()` returns the new Item, so there's no need to search for it by title and fetch it again
+    exported_item_obj = item.export(fname, export_format=ftype, parameters=None, wait=True)
+    exported_item_obj.download(save_path=newpath)
+    if exported_item_obj.title != item.title and exported_item_obj.itemid != in_fc: # nuke prod make dev sad...
+        exported_item_obj.delete(dry_run=False)
+        return True
+
+    return False
+
+def _download_csvs(newpath:str, verbose:bool, dir_ext:str, log_rows:list=None, compress:bool=True) -> None:
     """Download a csv of each table in a dictionary of table names and AGOL urls
 
     Args:
         newpath (str): relative or absolute filepath to the directory where you want to save the files
         verbose (bool): Turn on or off messaging
         dir_ext (str): The timestamp that becomes the directory name and is included in the log entry
+        log_rows (list, optional): The caller's list of log entries; see `utils._log_batch()`. If None, this function writes its own entries when it finishes. Defaults to None.
+        compress (bool, optional): True writes each table as a gzipped '.csv.gz' (several times smaller to write to the network share); False writes a plain '.csv'. Defaults to True.
 
     Returns:
         None
 
     """
 
-    for k,v in assets.WATER_AGOL_ASSETS.items():
-        df:pd.DataFrame = _agol_tbl_to_df(in_fc=v)
-        fname:str = os.path.join(newpath, k + '.csv')
-        try:
-            df.to_csv(fname, index=False)
-            log_res:str='success'
-            utils._add_log_entry(log_timestamp=dir_ext, src_file=v, log_dest=os.path.join(newpath, fname.rsplit('\\',1)[1]), log_result=log_res)
-            if verbose == True:
-                print(f'Queried tbl {k=} from source...')
-                print(f'Wrote csv: {fname=}')
-        except Exception as e:
-                print(e)
-                log_res = 'fail'
-                utils._add_log_entry(log_timestamp=dir_ext, src_file=v, log_dest=os.path.join(newpath, fname.rsplit('\\',1)[1]), log_result=log_res)
+    ext:str = '.csv.gz' if compress else '.csv'
+
+    with utils._log_batch(log_rows=log_rows) as log_rows:
+        # arcpy isn't thread-safe, so the tables are queried one at a time on this thread; only the csv writes (and gzip) run concurrently
+        # log entries are made from this thread, in the order of `assets.WATER_AGOL_ASSETS`
+        assets_items = list(assets.WATER_AGOL_ASSETS.items())
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(assets_items)))) as ex:
+            futures = {}
+            errors:dict = {} # {table name: the exception from its query}; these tables have nothing to write
+            for k,v in assets_items:
+                fname:str = os.path.join(newpath, k + ext)
+                try:
+                    df:pd.DataFrame = _agol_tbl_to_df(in_fc=v)
+                    futures[k] = ex.submit(_write_csv, df=df, fname=fname)
+                except Exception as e:
+                    print(e)
+                    errors[k] = e
+            for k,v in assets_items:
+                fname:str = os.path.join(newpath, k + ext)
+                if k in errors:
+                    log_res = 'fail'
+                    utils._add_log_entry(log_timestamp=dir_ext, src_file=v, log_dest=fname, log_result=log_res, log_rows=log_rows)
+                    continue
+                try:
+                    futures[k].result()
+                    log_res:str='success'
+                    utils._add_log_entry(log_timestamp=dir_ext, src_file=v, log_dest=fname, log_result=log_res, log_rows=log_rows)
+                    if verbose:
+                        print(f'Queried tbl {k=} from source...')
+                        print(f'Wrote csv: {fname=}')
+                except Exception as e:
+                    print(e)
+                    log_res = 'fail'
+                    utils._add_log_entry(log_timestamp=dir_ext, src_file=v, log_dest=fname, log_result=log_res, log_rows=log_rows)
 
     return None
 
+def _write_csv(df:pd.DataFrame, fname:str) -> str:
+    """Save one queried AGOL table as a csv, for `_download_csvs()`
+
+    Args:
+        df (pd.DataFrame): the table, from `_agol_tbl_to_df()`
+        fname (str): relative or absolute filepath for the csv; a name ending in '.gz' is gzipped
+
+    Returns:
+        str: `fname`
+    """
+    # level 1 gets most of gzip's size reduction for a fraction of the cpu; a fixed mtime keeps the bytes identical for identical data
+    compression = {'method':'gzip', 'compresslevel':1, 'mtime':1} if fname.endswith('.gz') else None
+    df.to_csv(fname, index=False, compression=compression)
+
+    return fname
+
 def _load_feature(csv_filepath:str, target_itemid:str, verbose:bool) -> None:
     """Loads a csv to a hosted feature layer in AGOL
 
@@ -177,11 +278,12 @@ def _load_feature(csv_filepath:str, target_itemid:str, verbose:bool) -> None:
     Returns:
         None
     """
-    dir_ext:str = csv_filepath.rsplit('\\',2)[1]
+    dir_ext:str = os.path.basename(os.path.dirname(csv_filepath)) # the timestamped backup folder holding the csv
     # https://developers.arcgis.com/python/samples/overwriting-feature-layers/
     try:
-        gis = GIS('home') # update to user/pw 
+        gis = _get_gis()
         item = gis.content.get(target_itemid)
+        from arcgis.features.layer import FeatureLayerCollection
         dashboard_be = FeatureLayerCollection.fromitem(item)
         if csv_filepath.rsplit('.csv',1)[0].endswith(dashboard_be.properties.layers[0].name):
             dashboard_be.manager.overwrite(csv_filepath)
@@ -193,7 +295,7 @@ def _load_feature(csv_filepath:str, target_itemid:str, verbose:bool) -> None:
             log_res = 'success - overwrote dashboard feature'
             utils._add_log_entry(log_timestamp=dir_ext, src_file=assets.WATER_PROD_QC_DASHBOARD_BACKEND, log_dest=csv_filepath, log_result=log_res)
 
-            if verbose == True:
+            if verbose:
                 print(f'Uploaded {csv_filepath=} to {target_itemid=}')
         else:
             print(f'Name mismatch: {csv_filepath=} to {target_itemid=}')
@@ -201,7 +303,7 @@ def _load_feature(csv_filepath:str, target_itemid:str, verbose:bool) -> None:
     except:
         log_res='fail - did not overwrite dashboard backend feature'
         utils._add_log_entry(log_timestamp=dir_ext, src_file=assets.WATER_PROD_QC_DASHBOARD_BACKEND, log_dest=csv_filepath, log_result=log_res)
-        if verbose == True:
+        if verbose:
             print(f'Failed to upload {csv_filepath=} to {target_itemid=}')
 
     return None
@@ -210,16 +312,16 @@ def _save_dashboard_csv(df:pd.DataFrame, newest_data_folder:str, verbose:bool) -
 
     # connect to AGOL
     # find the item.name at 
-    gis = GIS('home') # update to user/pw 
+    gis = _get_gis()
     item = gis.content.get(assets.WATER_PROD_QC_DASHBOARD_BACKEND)
     
     fname = os.path.join(newest_data_folder, f'{item.title}.csv')
-    dir_ext:str = newest_data_folder.rsplit('\\',1)[1]
+    dir_ext:str = os.path.basename(os.path.normpath(newest_data_folder))
     try:
         df.to_csv(fname, index=False)
         log_res = 'success'
         utils._add_log_entry(log_timestamp=dir_ext, src_file=assets.WATER_PROD_QC_DASHBOARD_BACKEND, log_dest=fname, log_result=log_res)
-        if verbose == True:
+        if verbose:
             print(f'Wrote csv to {fname=}')
         return fname
     except:
@@ -19,19 +19,19 @@ import os
 # utils.backup_veg(src_dir=r'data', dest_dir='output')
 
 # # test: save the csv-collection from agol
-# mytimestamp = str(dt.datetime.now()).replace(' ','_').replace('.','_').replace(':','')
+# mytimestamp = utils._timestamp_dirname()
 # wtb._agol_hosted_feature(newpath='output/', verbose=True, dir_ext=mytimestamp, in_fc=src_assets.WATER_DEV_ITEM_ID, download_types=['CSV'])
 
 # # test: save the fgdb from agol
-# mytimestamp = str(dt.datetime.now()).replace(' ','_').replace('.','_').replace(':','')
+# mytimestamp = utils._timestamp_dirname()
 # wtb._agol_hosted_feature(newpath='output/', verbose=True, dir_ext=mytimestamp, in_fc=src_assets.WATER_DEV_ITEM_ID, download_types=['File Geodatabase'])
 
 # # test: save both csv and fgdb from agol in one call
-# mytimestamp = str(dt.datetime.now()).replace(' ','_').replace('.','_').replace(':','')
+# mytimestamp = utils._timestamp_dirname()
 # wtb._agol_hosted_feature(newpath='output/', verbose=True, dir_ext=mytimestamp, in_fc=src_assets.WATER_DEV_ITEM_ID)
 
 # # test: copy each survey from dev location
-# dir_ext:str = str(dt.datetime.now()).replace(' ','_').replace('.','_').replace(':','')
+# dir_ext:str = utils._timestamp_dirname()
 # dest_dir:str='output'
 # verbose=True
 # newpath:str = os.path.join(dest_dir, dir_ext)
@@ -40,7 +40,7 @@ import os
 #     utils._backup_make_file_copies(dir_ext=dir_ext, newpath=newpath, src_dir=d, filetypes=['*'], verbose=verbose)
 
 # # test: copy each survey from prod location
-# dir_ext:str = str(dt.datetime.now()).replace(' ','_').replace('.','_').replace(':','')
+# dir_ext:str = utils._timestamp_dirname()
 # dest_dir:str='output'
 # verbose=True
 # newpath:str = os.path.join(dest_dir, dir_ext)